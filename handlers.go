@@ -60,10 +60,16 @@ func sqsHandler(w http.ResponseWriter, r *http.Request) {
 		handleListQueues(w, r)
 	case "SendMessage":
 		handleSendMessage(w, r)
+	case "SendMessageBatch":
+		handleSendMessageBatch(w, r)
 	case "ReceiveMessage":
 		handleReceiveMessage(w, r)
 	case "DeleteMessage":
 		handleDeleteMessage(w, r)
+	case "DeleteMessageBatch":
+		handleDeleteMessageBatch(w, r)
+	case "ChangeMessageVisibility":
+		handleChangeMessageVisibility(w, r)
 	case "GetQueueAttributes":
 		handleGetQueueAttributes(w, r)
 	case "PurgeQueue":
@@ -367,9 +373,131 @@ func handleSendMessage(w http.ResponseWriter, r *http.Request) {
 	sendResponse(w, r, resp, jsonResp)
 }
 
+func handleSendMessageBatch(w http.ResponseWriter, r *http.Request) {
+	var queueURL string
+
+	type batchEntry struct {
+		Id              string
+		Body            string
+		DelaySeconds    int
+		DeduplicationId string
+		GroupId         string
+	}
+	entries := make([]batchEntry, 0)
+
+	// Check if this is a JSON request
+	if r.Header.Get("X-Amz-Target") != "" {
+		jsonBody, err := parseRequestJSON(r)
+		if err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse JSON request", http.StatusBadRequest)
+			return
+		}
+
+		if url, ok := jsonBody["QueueUrl"].(string); ok {
+			queueURL = url
+		}
+		if rawEntries, ok := jsonBody["Entries"].([]interface{}); ok {
+			for _, raw := range rawEntries {
+				entryMap, ok := raw.(map[string]interface{})
+				if !ok {
+					continue
+				}
+				entry := batchEntry{}
+				if id, ok := entryMap["Id"].(string); ok {
+					entry.Id = id
+				}
+				if body, ok := entryMap["MessageBody"].(string); ok {
+					entry.Body = body
+				}
+				if delay, ok := entryMap["DelaySeconds"].(float64); ok {
+					entry.DelaySeconds = int(delay)
+				}
+				if dedupId, ok := entryMap["MessageDeduplicationId"].(string); ok {
+					entry.DeduplicationId = dedupId
+				}
+				if groupId, ok := entryMap["MessageGroupId"].(string); ok {
+					entry.GroupId = groupId
+				}
+				entries = append(entries, entry)
+			}
+		}
+	} else {
+		// Form-encoded request
+		if err := r.ParseForm(); err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse request", http.StatusBadRequest)
+			return
+		}
+		queueURL = r.FormValue("QueueUrl")
+		for i := 1; ; i++ {
+			prefix := "SendMessageBatchRequestEntry." + strconv.Itoa(i) + "."
+			id := r.FormValue(prefix + "Id")
+			if id == "" {
+				break
+			}
+			entries = append(entries, batchEntry{
+				Id:              id,
+				Body:            r.FormValue(prefix + "MessageBody"),
+				DelaySeconds:    parseIntDefault(r.FormValue(prefix+"DelaySeconds"), 0),
+				DeduplicationId: r.FormValue(prefix + "MessageDeduplicationId"),
+				GroupId:         r.FormValue(prefix + "MessageGroupId"),
+			})
+		}
+	}
+
+	if len(entries) == 0 {
+		sendError(w, "EmptyBatchRequest", "The batch request doesn't contain any entries", http.StatusBadRequest)
+		return
+	}
+	if len(entries) > 10 {
+		sendError(w, "TooManyEntriesInBatchRequest", "The batch request contains more entries than permissible", http.StatusBadRequest)
+		return
+	}
+
+	queueName := extractQueueName(queueURL)
+
+	queue, exists := queueManager.GetQueue(queueName)
+	if !exists {
+		sendError(w, "NonExistentQueue", "Queue does not exist", http.StatusBadRequest)
+		return
+	}
+
+	type ResultEntry struct {
+		Id               string `xml:"Id" json:"Id"`
+		MessageId        string `xml:"MessageId" json:"MessageId"`
+		MD5OfMessageBody string `xml:"MD5OfMessageBody" json:"MD5OfMessageBody"`
+		SequenceNumber   string `xml:"SequenceNumber,omitempty" json:"SequenceNumber,omitempty"`
+	}
+
+	type SendMessageBatchResponse struct {
+		XMLName xml.Name      `xml:"SendMessageBatchResponse" json:"-"`
+		Entries []ResultEntry `xml:"SendMessageBatchResult>SendMessageBatchResultEntry" json:"-"`
+	}
+
+	type SendMessageBatchJSONResponse struct {
+		Successful []ResultEntry `json:"Successful"`
+		Failed     []interface{} `json:"Failed"`
+	}
+
+	resp := SendMessageBatchResponse{}
+	jsonResp := SendMessageBatchJSONResponse{Failed: []interface{}{}}
+	for _, entry := range entries {
+		msg := queue.SendMessage(entry.Body, make(map[string]interface{}), entry.DelaySeconds, entry.DeduplicationId, entry.GroupId)
+		result := ResultEntry{
+			Id:               entry.Id,
+			MessageId:        msg.MessageID,
+			MD5OfMessageBody: msg.MD5OfBody,
+			SequenceNumber:   msg.SequenceNumber,
+		}
+		resp.Entries = append(resp.Entries, result)
+		jsonResp.Successful = append(jsonResp.Successful, result)
+	}
+
+	sendResponse(w, r, resp, jsonResp)
+}
+
 func handleReceiveMessage(w http.ResponseWriter, r *http.Request) {
 	var queueURL string
-	var maxMessages, visibilityTimeout int
+	var maxMessages, visibilityTimeout, waitTimeSeconds int
 	var visibilityTimeoutProvided bool
 
 	// Check if this is a JSON request
@@ -392,6 +520,9 @@ func handleReceiveMessage(w http.ResponseWriter, r *http.Request) {
 			visibilityTimeout = int(vis)
 			visibilityTimeoutProvided = true
 		}
+		if wait, ok := jsonBody["WaitTimeSeconds"].(float64); ok {
+			waitTimeSeconds = int(wait)
+		}
 	} else {
 		// Form-encoded request
 		if err := r.ParseForm(); err != nil {
@@ -404,10 +535,15 @@ func handleReceiveMessage(w http.ResponseWriter, r *http.Request) {
 			visibilityTimeout = parseIntDefault(r.FormValue("VisibilityTimeout"), 0)
 			visibilityTimeoutProvided = true
 		}
+		waitTimeSeconds = parseIntDefault(r.FormValue("WaitTimeSeconds"), 0)
+	}
+
+	// Cap at the SQS maximum long-poll duration
+	if waitTimeSeconds > 20 {
+		waitTimeSeconds = 20
 	}
 
 	queueName := extractQueueName(queueURL)
-	waitTimeSeconds := parseIntDefault(r.FormValue("WaitTimeSeconds"), 0)
 
 	queue, exists := queueManager.GetQueue(queueName)
 	if !exists {
@@ -498,6 +634,178 @@ func handleDeleteMessage(w http.ResponseWriter, r *http.Request) {
 	}
 }
 
+func handleDeleteMessageBatch(w http.ResponseWriter, r *http.Request) {
+	var queueURL string
+
+	type batchEntry struct {
+		Id            string
+		ReceiptHandle string
+	}
+	entries := make([]batchEntry, 0)
+
+	// Check if this is a JSON request
+	if r.Header.Get("X-Amz-Target") != "" {
+		jsonBody, err := parseRequestJSON(r)
+		if err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse JSON request", http.StatusBadRequest)
+			return
+		}
+
+		if url, ok := jsonBody["QueueUrl"].(string); ok {
+			queueURL = url
+		}
+		if rawEntries, ok := jsonBody["Entries"].([]interface{}); ok {
+			for _, raw := range rawEntries {
+				entryMap, ok := raw.(map[string]interface{})
+				if !ok {
+					continue
+				}
+				entry := batchEntry{}
+				if id, ok := entryMap["Id"].(string); ok {
+					entry.Id = id
+				}
+				if receipt, ok := entryMap["ReceiptHandle"].(string); ok {
+					entry.ReceiptHandle = receipt
+				}
+				entries = append(entries, entry)
+			}
+		}
+	} else {
+		// Form-encoded request
+		if err := r.ParseForm(); err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse request", http.StatusBadRequest)
+			return
+		}
+		queueURL = r.FormValue("QueueUrl")
+		for i := 1; ; i++ {
+			prefix := "DeleteMessageBatchRequestEntry." + strconv.Itoa(i) + "."
+			id := r.FormValue(prefix + "Id")
+			if id == "" {
+				break
+			}
+			entries = append(entries, batchEntry{
+				Id:            id,
+				ReceiptHandle: r.FormValue(prefix + "ReceiptHandle"),
+			})
+		}
+	}
+
+	if len(entries) == 0 {
+		sendError(w, "EmptyBatchRequest", "The batch request doesn't contain any entries", http.StatusBadRequest)
+		return
+	}
+	if len(entries) > 10 {
+		sendError(w, "TooManyEntriesInBatchRequest", "The batch request contains more entries than permissible", http.StatusBadRequest)
+		return
+	}
+
+	queueName := extractQueueName(queueURL)
+
+	queue, exists := queueManager.GetQueue(queueName)
+	if !exists {
+		sendError(w, "NonExistentQueue", "Queue does not exist", http.StatusBadRequest)
+		return
+	}
+
+	type ResultEntry struct {
+		Id string `xml:"Id" json:"Id"`
+	}
+
+	type FailedEntry struct {
+		Id          string `xml:"Id" json:"Id"`
+		SenderFault bool   `xml:"SenderFault" json:"SenderFault"`
+		Code        string `xml:"Code" json:"Code"`
+		Message     string `xml:"Message" json:"Message"`
+	}
+
+	type DeleteMessageBatchResponse struct {
+		XMLName xml.Name      `xml:"DeleteMessageBatchResponse" json:"-"`
+		Entries []ResultEntry `xml:"DeleteMessageBatchResult>DeleteMessageBatchResultEntry" json:"-"`
+		Failed  []FailedEntry `xml:"DeleteMessageBatchResult>BatchResultErrorEntry" json:"-"`
+	}
+
+	type DeleteMessageBatchJSONResponse struct {
+		Successful []ResultEntry `json:"Successful"`
+		Failed     []FailedEntry `json:"Failed"`
+	}
+
+	resp := DeleteMessageBatchResponse{}
+	jsonResp := DeleteMessageBatchJSONResponse{Successful: []ResultEntry{}, Failed: []FailedEntry{}}
+	for _, entry := range entries {
+		if queue.DeleteMessage(entry.ReceiptHandle) {
+			result := ResultEntry{Id: entry.Id}
+			resp.Entries = append(resp.Entries, result)
+			jsonResp.Successful = append(jsonResp.Successful, result)
+		} else {
+			failed := FailedEntry{
+				Id:          entry.Id,
+				SenderFault: true,
+				Code:        "ReceiptHandleIsInvalid",
+				Message:     "Invalid receipt handle",
+			}
+			resp.Failed = append(resp.Failed, failed)
+			jsonResp.Failed = append(jsonResp.Failed, failed)
+		}
+	}
+
+	sendResponse(w, r, resp, jsonResp)
+}
+
+func handleChangeMessageVisibility(w http.ResponseWriter, r *http.Request) {
+	var queueURL, receiptHandle string
+	var visibilityTimeout int
+	isJSON := r.Header.Get("X-Amz-Target") != ""
+
+	// Check if this is a JSON request
+	if isJSON {
+		jsonBody, err := parseRequestJSON(r)
+		if err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse JSON request", http.StatusBadRequest)
+			return
+		}
+
+		if url, ok := jsonBody["QueueUrl"].(string); ok {
+			queueURL = url
+		}
+		if receipt, ok := jsonBody["ReceiptHandle"].(string); ok {
+			receiptHandle = receipt
+		}
+		if vis, ok := jsonBody["VisibilityTimeout"].(float64); ok {
+			visibilityTimeout = int(vis)
+		}
+	} else {
+		// Form-encoded request
+		if err := r.ParseForm(); err != nil {
+			sendError(w, "InvalidParameterValue", "Failed to parse request", http.StatusBadRequest)
+			return
+		}
+		queueURL = r.FormValue("QueueUrl")
+		receiptHandle = r.FormValue("ReceiptHandle")
+		visibilityTimeout = parseIntDefault(r.FormValue("VisibilityTimeout"), 0)
+	}
+
+	queueName := extractQueueName(queueURL)
+
+	queue, exists := queueManager.GetQueue(queueName)
+	if !exists {
+		sendError(w, "NonExistentQueue", "Queue does not exist", http.StatusBadRequest)
+		return
+	}
+
+	if queue.ChangeMessageVisibility(receiptHandle, visibilityTimeout) {
+		if isJSON {
+			sendJSONResponse(w, struct{}{})
+		} else {
+			type ChangeMessageVisibilityResponse struct {
+				XMLName xml.Name `xml:"ChangeMessageVisibilityResponse"`
+			}
+			sendXMLResponse(w, ChangeMessageVisibilityResponse{})
+		}
+	} else {
+		sendError(w, "ReceiptHandleIsInvalid", "Invalid receipt handle", http.StatusBadRequest)
+	}
+}
+
 func handleGetQueueAttributes(w http.ResponseWriter, r *http.Request) {
 	var queueURL string
 	isJSON := r.Header.Get("X-Amz-Target") != ""
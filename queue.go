@@ -294,8 +294,21 @@ func (q *Queue) checkVisibilityTimeoutsAndDLQ() {
 	}
 }
 
-// ReceiveMessages retrieves messages from the queue
+// ReceiveMessages retrieves messages from the queue, long-polling for up
+// to waitTimeSeconds when none are immediately available
 func (q *Queue) ReceiveMessages(maxMessages int, visibilityTimeout int, waitTimeSeconds int) []*Message {
+	deadline := time.Now().Add(time.Duration(waitTimeSeconds) * time.Second)
+	for {
+		messages := q.receiveAvailable(maxMessages, visibilityTimeout)
+		if len(messages) > 0 || !time.Now().Before(deadline) {
+			return messages
+		}
+		time.Sleep(100 * time.Millisecond)
+	}
+}
+
+// receiveAvailable collects currently visible messages and marks them in flight
+func (q *Queue) receiveAvailable(maxMessages int, visibilityTimeout int) []*Message {
 	q.mu.Lock()
 	defer q.mu.Unlock()
 
@@ -351,6 +364,20 @@ func (q *Queue) ReceiveMessages(maxMessages int, visibilityTimeout int, waitTime
 	return available
 }
 
+// ChangeMessageVisibility updates the visibility timeout of an in-flight message
+func (q *Queue) ChangeMessageVisibility(receiptHandle string, visibilityTimeout int) bool {
+	q.mu.Lock()
+	defer q.mu.Unlock()
+
+	for _, msg := range q.Messages {
+		if msg.ReceiptHandle == receiptHandle {
+			msg.VisibilityTimeout = time.Now().Add(time.Duration(visibilityTimeout) * time.Second)
+			return true
+		}
+	}
+	return false
+}
+
 // DeleteMessage removes a message from the queue
 func (q *Queue) DeleteMessage(receiptHandle string) bool {
 	q.mu.Lock()
@@ -4,16 +4,42 @@ Integration tests for Ess-Queue-Ess SQS emulator.
 Tests core SQS operations and admin UI functionality.
 """
 
+import functools
 import json
+import re
 import requests
 import sys
 import time
-from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus, urlencode
+
+try:
+    # Optional: SIMD-accelerated JSON parsing for the admin API payloads,
+    # which embed every queue's message list and grow with queue count
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
 
 BASE_URL = "http://localhost:9324"
 ADMIN_URL = f"{BASE_URL}/admin"
 API_URL = f"{BASE_URL}/admin/api/queues"
 
+# One shared session so all ~30 HTTP calls reuse a single keep-alive
+# connection instead of opening a fresh one per request.
+SESSION = requests.Session()
+SESSION.headers['Connection'] = 'keep-alive'
+SESSION.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+# Precompiled pattern for extracting fields from the XML responses; tag
+# counting happens on the raw bytes (response.content) to skip the
+# Unicode decode entirely
+RECEIPT_HANDLE_RE = re.compile(r'<ReceiptHandle>([^<]+)</ReceiptHandle>')
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -33,35 +59,54 @@ def print_error(msg):
 def print_info(msg):
     print(f"  {Colors.YELLOW}ℹ{Colors.END} {msg}")
 
+@functools.lru_cache(maxsize=64)
+def queue_url(name):
+    """Build (and cache) the queue URL for a queue name"""
+    return f"{BASE_URL}/{name}"
+
+@functools.lru_cache(maxsize=64)
+def ensure_queue(name):
+    """Create a queue once per run; repeat calls are served from cache
+    since CreateQueue on an existing queue is just a no-op round-trip"""
+    response = sqs_request('CreateQueue', {'QueueName': name})
+    assert response.status_code == 200, f"Create queue failed: {response.status_code}"
+    return queue_url(name)
+
 def sqs_request(action, params=None):
     """Make an SQS API request"""
     if params is None:
         params = {}
     params['Action'] = action
     
-    response = requests.post(BASE_URL, data=params)
+    response = SESSION.post(BASE_URL, data=params)
     return response
 
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+def sqs_request_raw(body):
+    """Post a pre-encoded form body, skipping the per-call dict encode"""
+    return SESSION.post(BASE_URL, data=body, headers=FORM_HEADERS)
+
 def test_health_check():
     print_test("Health Check")
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     assert response.status_code == 200, f"Health check failed: {response.status_code}"
-    data = response.json()
+    data = json_loads(response.content)
     assert data.get('status') == 'healthy', f"Unexpected health status: {data}"
     print_success("Health endpoint returns healthy status")
 
 def test_admin_ui():
     print_test("Admin UI")
-    response = requests.get(ADMIN_URL)
+    response = SESSION.get(ADMIN_URL)
     assert response.status_code == 200, f"Admin UI failed: {response.status_code}"
     assert 'Ess-Queue-Ess Admin' in response.text, "Admin UI HTML not found"
     print_success("Admin UI loads successfully")
 
 def test_admin_api():
     print_test("Admin API")
-    response = requests.get(API_URL)
+    response = SESSION.get(API_URL)
     assert response.status_code == 200, f"Admin API failed: {response.status_code}"
-    data = response.json()
+    data = json_loads(response.content)
     assert 'queues' in data, "Admin API missing queues field"
     print_success(f"Admin API returns {len(data['queues'])} queues")
     return data['queues']
@@ -79,7 +124,7 @@ def test_list_queues(expected_count=None):
     print_test("List Queues")
     response = sqs_request('ListQueues')
     assert response.status_code == 200, f"List queues failed: {response.status_code}"
-    queue_count = response.text.count('<QueueUrl>')
+    queue_count = response.content.count(b'<QueueUrl>')
     if expected_count is not None:
         assert queue_count >= expected_count, f"Expected at least {expected_count} queues, got {queue_count}"
     print_success(f"Listed {queue_count} queues")
@@ -87,11 +132,11 @@ def test_list_queues(expected_count=None):
 
 def test_send_message(queue_name):
     print_test("Send Message")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     message_body = "Test message from integration tests"
     
     response = sqs_request('SendMessage', {
-        'QueueUrl': queue_url,
+        'QueueUrl': url,
         'MessageBody': message_body
     })
     
@@ -101,54 +146,62 @@ def test_send_message(queue_name):
 
 def test_send_multiple_messages(queue_name, count=5):
     print_test(f"Send {count} Messages")
-    queue_url = f"{BASE_URL}/{queue_name}"
-    
+    url = queue_url(queue_name)
+
+    # One SendMessageBatch round-trip instead of `count` SendMessage calls;
+    # encode the static portion once and append only the per-entry fields
+    parts = [urlencode({'Action': 'SendMessageBatch', 'QueueUrl': url})]
     for i in range(count):
-        response = sqs_request('SendMessage', {
-            'QueueUrl': queue_url,
-            'MessageBody': f"Test message #{i+1}"
-        })
-        assert response.status_code == 200, f"Send message {i+1} failed"
-    
-    print_success(f"Sent {count} messages to '{queue_name}'")
+        parts.append(f'SendMessageBatchRequestEntry.{i+1}.Id={i+1}')
+        parts.append(f'SendMessageBatchRequestEntry.{i+1}.MessageBody=' + quote_plus(f"Test message #{i+1}"))
+
+    response = sqs_request_raw('&'.join(parts))
+    assert response.status_code == 200, f"Send message batch failed: {response.status_code}"
+    success_count = response.content.count(b'<SendMessageBatchResultEntry>')
+    assert success_count == count, f"Expected {count} successful sends, got {success_count}"
+
+    print_success(f"Sent {count} messages to '{queue_name}' in one batch")
 
 def test_receive_message(queue_name, expected_count=1):
     print_test("Receive Messages")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     
+    # VisibilityTimeout=0 leaves the messages visible, so the delete
+    # test that follows can actually receive one instead of long-polling
+    # an empty queue for the full WaitTimeSeconds
     response = sqs_request('ReceiveMessage', {
-        'QueueUrl': queue_url,
-        'MaxNumberOfMessages': '10'
+        'QueueUrl': url,
+        'MaxNumberOfMessages': '10',
+        'VisibilityTimeout': '0',
+        'WaitTimeSeconds': '2'
     })
-    
+
     assert response.status_code == 200, f"Receive message failed: {response.status_code}"
-    message_count = response.text.count('<MessageId>')
+    message_count = response.content.count(b'<MessageId>')
     assert message_count >= expected_count, f"Expected at least {expected_count} messages, got {message_count}"
     print_success(f"Received {message_count} messages from '{queue_name}'")
     return response.text
 
 def test_delete_message(queue_name):
     print_test("Delete Message")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     
     # First receive a message to get receipt handle
     response = sqs_request('ReceiveMessage', {
-        'QueueUrl': queue_url,
-        'MaxNumberOfMessages': '1'
+        'QueueUrl': url,
+        'MaxNumberOfMessages': '1',
+        'WaitTimeSeconds': '2'
     })
     
-    if '<ReceiptHandle>' not in response.text:
+    match = RECEIPT_HANDLE_RE.search(response.text)
+    if match is None:
         print_info("No messages to delete (queue is empty)")
         return
-    
-    # Extract receipt handle (simple parsing)
-    start = response.text.find('<ReceiptHandle>') + len('<ReceiptHandle>')
-    end = response.text.find('</ReceiptHandle>')
-    receipt_handle = response.text[start:end]
+    receipt_handle = match.group(1)
     
     # Delete the message
     response = sqs_request('DeleteMessage', {
-        'QueueUrl': queue_url,
+        'QueueUrl': url,
         'ReceiptHandle': receipt_handle
     })
     
@@ -157,10 +210,10 @@ def test_delete_message(queue_name):
 
 def test_get_queue_attributes(queue_name):
     print_test("Get Queue Attributes")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     
     response = sqs_request('GetQueueAttributes', {
-        'QueueUrl': queue_url,
+        'QueueUrl': url,
         'AttributeName.1': 'All'
     })
     
@@ -170,31 +223,31 @@ def test_get_queue_attributes(queue_name):
 
 def test_purge_queue(queue_name):
     print_test("Purge Queue")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     
     response = sqs_request('PurgeQueue', {
-        'QueueUrl': queue_url
+        'QueueUrl': url
     })
     
     assert response.status_code == 200, f"Purge queue failed: {response.status_code}"
     print_success(f"Queue '{queue_name}' purged")
     
-    # Verify queue is empty
-    time.sleep(0.5)  # Brief pause
-    response = sqs_request('ReceiveMessage', {
-        'QueueUrl': queue_url,
-        'MaxNumberOfMessages': '10'
-    })
-    message_count = response.text.count('<MessageId>')
-    assert message_count == 0, f"Queue not empty after purge: {message_count} messages"
+    # Verify via the admin API's aggregated view; one GET replaces a
+    # fresh ReceiveMessage round-trip against the purged queue
+    response = SESSION.get(API_URL)
+    data = json_loads(response.content)
+    queues_by_name = {q['name']: q for q in data['queues']}
+    test_queue = queues_by_name.get(queue_name)
+    assert test_queue is not None, f"Queue '{queue_name}' not found in admin API"
+    assert test_queue['visible_count'] == 0, f"Queue not empty after purge: {test_queue['visible_count']} messages"
     print_success("Verified queue is empty after purge")
 
 def test_delete_queue(queue_name):
     print_test("Delete Queue")
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = queue_url(queue_name)
     
     response = sqs_request('DeleteQueue', {
-        'QueueUrl': queue_url
+        'QueueUrl': url
     })
     
     assert response.status_code == 200, f"Delete queue failed: {response.status_code}"
@@ -205,37 +258,41 @@ def test_admin_api_with_messages():
     
     # Create queue and add messages
     queue_name = "admin-test-queue"
-    response = sqs_request('CreateQueue', {'QueueName': queue_name})
-    queue_url = f"{BASE_URL}/{queue_name}"
+    url = ensure_queue(queue_name)
     
-    # Send 3 messages
+    # Send 3 messages in a single pre-encoded batch
+    parts = [urlencode({'Action': 'SendMessageBatch', 'QueueUrl': url})]
     for i in range(3):
-        sqs_request('SendMessage', {
-            'QueueUrl': queue_url,
-            'MessageBody': f"Admin test message #{i+1}"
-        })
-    
-    time.sleep(0.5)  # Brief pause for messages to be processed
-    
-    # Check admin API
-    response = requests.get(API_URL)
-    data = response.json()
-    
-    # Find our queue in the response
-    test_queue = None
-    for q in data['queues']:
-        if q['name'] == queue_name:
-            test_queue = q
+        parts.append(f'SendMessageBatchRequestEntry.{i+1}.Id={i+1}')
+        parts.append(f'SendMessageBatchRequestEntry.{i+1}.MessageBody=' + quote_plus(f"Admin test message #{i+1}"))
+    response = sqs_request_raw('&'.join(parts))
+    assert response.status_code == 200, f"Send message batch failed: {response.status_code}"
+    success_count = response.content.count(b'<SendMessageBatchResultEntry>')
+    assert success_count == 3, f"Expected 3 successful sends, got {success_count}"
+    
+    # Poll the admin API with backoff until the messages show up instead
+    # of sleeping a fixed interval
+    delay = 0.05
+    deadline = time.monotonic() + 2.0
+    while True:
+        response = SESSION.get(API_URL)
+        data = json_loads(response.content)
+        queues_by_name = {q['name']: q for q in data['queues']}
+        test_queue = queues_by_name.get(queue_name)
+        if (test_queue and test_queue['visible_count'] == 3) or time.monotonic() >= deadline:
             break
-    
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+
     assert test_queue is not None, f"Queue '{queue_name}' not found in admin API"
     assert test_queue['visible_count'] == 3, f"Expected 3 visible messages, got {test_queue['visible_count']}"
     assert len(test_queue['messages']) == 3, f"Expected 3 messages in data, got {len(test_queue['messages'])}"
     
     print_success(f"Admin API correctly shows 3 messages in '{queue_name}'")
-    
-    # Cleanup
-    sqs_request('DeleteQueue', {'QueueUrl': queue_url})
+
+    # Purge rather than delete: the admin API tests below reuse this
+    # queue, and test_admin_delete_queue owns the final cleanup
+    sqs_request('PurgeQueue', {'QueueUrl': url})
 
 def test_admin_create_queue():
     print_test("Admin API - Create Queue")
@@ -247,10 +304,11 @@ def test_admin_create_queue():
         "max_message_size": 131072
     }
     
-    response = requests.post(f"{BASE_URL}/admin/api/queue", json=queue_data)
+    response = SESSION.post(f"{BASE_URL}/admin/api/queue", data=json_dumps(queue_data),
+                            headers={'Content-Type': 'application/json'})
     assert response.status_code == 200, f"Failed to create queue via admin API: {response.text}"
     
-    data = response.json()
+    data = json_loads(response.content)
     assert data['success'] == True, "Expected success=true"
     assert data['queue']['name'] == "admin-test-queue", f"Queue name mismatch: {data}"
     assert data['queue']['visibility_timeout'] == 60, f"Visibility timeout mismatch: {data}"
@@ -267,21 +325,22 @@ def test_admin_send_message():
         "attributes": {}
     }
     
-    response = requests.post(f"{BASE_URL}/admin/api/message", json=message_data)
+    response = SESSION.post(f"{BASE_URL}/admin/api/message", data=json_dumps(message_data),
+                            headers={'Content-Type': 'application/json'})
     assert response.status_code == 200, f"Failed to send message via admin API: {response.text}"
     
-    data = response.json()
+    data = json_loads(response.content)
     assert data['success'] == True, "Expected success=true"
     assert 'message_id' in data, "Missing message_id in response"
     
     print_success(f"Message sent successfully via admin API (ID: {data['message_id']})")
     
     # Verify message was sent by checking admin API
-    response = requests.get(f"{BASE_URL}/admin/api/queues")
-    data = response.json()
-    queues = {q['name']: q for q in data['queues']}
+    response = SESSION.get(f"{BASE_URL}/admin/api/queues")
+    data = json_loads(response.content)
+    queues_by_name = {q['name']: q for q in data['queues']}
     
-    admin_queue = queues.get('admin-test-queue')
+    admin_queue = queues_by_name.get('admin-test-queue')
     assert admin_queue is not None, "Queue not found in admin API"
     assert admin_queue['visible_count'] == 1, f"Expected 1 visible message, got {admin_queue['visible_count']}"
     
@@ -290,7 +349,7 @@ def test_admin_send_message():
 def test_admin_export_config():
     print_test("Admin API - Export Config")
     
-    response = requests.get(f"{BASE_URL}/admin/api/config/export")
+    response = SESSION.get(f"{BASE_URL}/admin/api/config/export")
     assert response.status_code == 200, f"Failed to export config: {response.status_code}"
     assert response.headers.get('Content-Type') == 'application/x-yaml', "Wrong content type"
     assert 'config.yaml' in response.headers.get('Content-Disposition', ''), "Missing filename"
@@ -307,20 +366,20 @@ def test_admin_export_config():
 def test_admin_delete_queue():
     print_test("Admin API - Delete Queue")
     
-    response = requests.delete(f"{BASE_URL}/admin/api/queue?name=admin-test-queue")
+    response = SESSION.delete(f"{BASE_URL}/admin/api/queue?name=admin-test-queue")
     assert response.status_code == 200, f"Failed to delete queue via admin API: {response.text}"
     
-    data = response.json()
+    data = json_loads(response.content)
     assert data['success'] == True, "Expected success=true"
     assert 'deleted successfully' in data['message'].lower(), f"Unexpected message: {data['message']}"
     
     print_success("Queue deleted successfully via admin API")
     
     # Verify queue is gone
-    response = requests.get(f"{BASE_URL}/admin/api/queues")
-    data = response.json()
-    queue_names = [q['name'] for q in data['queues']]
-    assert 'admin-test-queue' not in queue_names, "Queue still exists after deletion"
+    response = SESSION.get(f"{BASE_URL}/admin/api/queues")
+    data = json_loads(response.content)
+    queues_by_name = {q['name']: q for q in data['queues']}
+    assert 'admin-test-queue' not in queues_by_name, "Queue still exists after deletion"
     
     print_success("Queue confirmed deleted")
 
@@ -330,13 +389,12 @@ def run_all_tests():
     print(f"{Colors.BLUE}{'='*60}{Colors.END}")
     
     try:
-        # Basic connectivity
-        test_health_check()
-        test_admin_ui()
-        
-        # Initial state
-        initial_queues = test_admin_api()
-        
+        # Basic connectivity and initial state checks are independent of
+        # each other, so run them concurrently on the shared session pool
+        independent_tests = [test_health_check, test_admin_ui, test_admin_api]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda f: f(), independent_tests))
+
         # Queue operations
         queue_name = test_create_queue()
         test_list_queues(expected_count=1)